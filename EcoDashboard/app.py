@@ -4,7 +4,7 @@ import plotly.graph_objects as go
 import pydeck as pdk
 import numpy as np
 import base64
-from datetime import datetime
+from datetime import datetime, date, timedelta
 from math import radians, sin, cos, sqrt, atan2
 
 # ============================================
@@ -32,6 +32,11 @@ if 'logged_in' not in st.session_state:
 
 # 3. IMPORT AUTH & CHECK
 import auth
+import group_planner
+import impact_log
+import shared_cache
+import assets
+import fares
 
 if not st.session_state.logged_in:
     auth.show_login_page()
@@ -125,6 +130,128 @@ FOOD_OPTIONS = {
     "With Relatives": {"price": 0, "co2": 0, "booking_link": "#"}
 }
 
+# --- SHARED CACHE ---
+# Keys carry a hash of the tables above, so editing any price or coordinate invalidates old entries
+CATALOG_VERSION = shared_cache.catalog_version(DESTINATIONS, INDIAN_CITIES, ACCOMMODATION_OPTIONS, FOOD_OPTIONS, *fares.PRICING_TABLES)
+route_cache = shared_cache.get_cache()
+
+def cached_distance(coord1, coord2):
+    return route_cache.get_or_compute("distance", CATALOG_VERSION, (tuple(coord1), tuple(coord2)), lambda: calculate_distance(coord1, coord2))
+
+def compute_route_results(user_coords, destination, travelers, days, transport, stay, food, travel_date, booked_on):
+    """Cost/CO2 for the chosen plan plus every eco alternative for one route"""
+    dest_info = DESTINATIONS[destination]
+    distance = cached_distance(user_coords, dest_info["coords"])
+    car_speed_avg = 60
+    car_time_hours = int(distance / car_speed_avg)
+    car_time_str = f"{car_time_hours}h {int((distance % car_speed_avg))}m"
+    base_delhi_distance = dest_info["distance"]
+    distance_ratio = distance / base_delhi_distance if base_delhi_distance > 0 else 1
+
+    transport_options_map = {
+        "Flight": {"name": dest_info["flight"]["name"], "price_per_person": int(dest_info["flight"]["price"] * distance_ratio), "co2_per_person": int(dest_info["flight"]["co2"] * distance_ratio), "time": dest_info["flight"]["time"], "type": "Flight"},
+        "Train": {"name": dest_info["train"]["name"], "price_per_person": int(dest_info["train"]["price"] * distance_ratio), "co2_per_person": int(dest_info["train"]["co2"] * distance_ratio), "time": dest_info["train"]["time"], "type": "Train"},
+        "Bus": {"name": dest_info["bus"]["name"], "price_per_person": int(dest_info["bus"]["price"] * distance_ratio), "co2_per_person": int(dest_info["bus"]["co2"] * distance_ratio), "time": dest_info["bus"]["time"], "type": "Bus"},
+        "Car (Personal)": {"name": "Personal Vehicle", "price_total_trip": distance * 15, "price_is_per_person": False, "co2_total_trip": distance * 0.15, "co2_is_per_person": False, "time": car_time_str, "type": "Car (Personal)"},
+        "Car (Taxi/Rental)": {"name": "Taxi / Rental", "price_total_trip": distance * 22, "price_is_per_person": False, "co2_total_trip": distance * 0.15, "co2_is_per_person": False, "time": car_time_str, "type": "Car (Taxi/Rental)"}
+    }
+
+    # Static fares are "normal demand"; adjust for season, booking lead time and load factor on the travel date
+    base_fares = {mode: dict(transport_options_map[mode]) for mode in fares.FARE_MODES}
+    for mode in fares.FARE_MODES:
+        data = transport_options_map[mode]
+        if data["price_per_person"] > 0:
+            price, co2 = fares.quote(destination, mode, data["price_per_person"], data["co2_per_person"], travel_date, booked_on)
+            data["price_per_person"], data["co2_per_person"] = int(price[0]), int(co2[0])
+
+    user_trans_data = transport_options_map[transport]
+    if user_trans_data.get("price_is_per_person", True):
+        transport_cost = user_trans_data["price_per_person"] * travelers
+        transport_co2 = user_trans_data["co2_per_person"] * travelers
+    else:
+        vehicles_needed = np.ceil(travelers / 4)
+        transport_cost = user_trans_data["price_total_trip"] * vehicles_needed
+        transport_co2 = user_trans_data["co2_total_trip"] * vehicles_needed
+    transport_name = user_trans_data["name"]
+
+    stay_cost = ACCOMMODATION_OPTIONS[stay]["price"] * days
+    stay_co2 = ACCOMMODATION_OPTIONS[stay]["co2"] * days
+    food_cost = FOOD_OPTIONS[food]["price"] * days * travelers
+    food_co2 = FOOD_OPTIONS[food]["co2"] * days * travelers
+    user_total_cost = transport_cost + stay_cost + food_cost
+    user_total_co2 = transport_co2 + stay_co2 + food_co2
+
+    all_combinations = []
+    for t_key, t_data in transport_options_map.items():
+        for s_key, s_data in ACCOMMODATION_OPTIONS.items():
+            if stay != "With Relatives" and s_key == "With Relatives": continue
+            if stay == "With Relatives" and s_key != "With Relatives": continue
+            for f_key, f_data in FOOD_OPTIONS.items():
+                if food != "With Relatives" and f_key == "With Relatives": continue
+                if food == "With Relatives" and f_key != "With Relatives": continue
+                if t_data.get("price_is_per_person", True):
+                    t_c = t_data["price_per_person"] * travelers
+                    t_e = t_data["co2_per_person"] * travelers
+                else:
+                    v_n = np.ceil(travelers / 4)
+                    t_c = t_data["price_total_trip"] * v_n
+                    t_e = t_data["co2_total_trip"] * v_n
+                s_c = s_data["price"] * days
+                s_e = s_data["co2"] * days
+                f_c = f_data["price"] * days * travelers
+                f_e = f_data["co2"] * days * travelers
+                tot_c = t_c + s_c + f_c
+                tot_e = t_e + s_e + f_e
+                eco_score = (tot_c / 1000) + (tot_e * 0.5)
+                all_combinations.append({"transport": t_key, "stay": s_key, "food": f_key, "total_cost": tot_c, "total_co2": tot_e, "transport_name": t_data["name"], "transport_cost": t_c, "stay_cost": s_c, "food_cost": f_c, "eco_score": eco_score})
+
+    all_combinations.sort(key=lambda x: x["eco_score"])
+    best_eco_combinations = all_combinations[:3] if all_combinations else [all_combinations[0]]
+
+    display_options = []
+    for t_key in ["Flight", "Train", "Bus", "Car (Personal)", "Car (Taxi/Rental)"]:
+        data = transport_options_map[t_key]
+        if data.get("price_is_per_person", True):
+            p = data["price_per_person"] * travelers
+            c = data["co2_per_person"] * travelers
+        else:
+            v_n = np.ceil(travelers / 4)
+            p = data["price_total_trip"] * v_n
+            c = data["co2_total_trip"] * v_n
+        display_options.append({"key": t_key, "data": data, "p": p, "c": c})
+
+    return {
+        "distance": distance,
+        "transport_options_map": transport_options_map,
+        "base_fares": base_fares,
+        "transport_cost": transport_cost, "transport_co2": transport_co2, "transport_name": transport_name,
+        "stay_cost": stay_cost, "stay_co2": stay_co2, "food_cost": food_cost, "food_co2": food_co2,
+        "user_total_cost": user_total_cost, "user_total_co2": user_total_co2,
+        "best_eco_combinations": best_eco_combinations,
+        "display_options": display_options,
+    }
+
+def build_map_spec(theme, user_location, user_coords, destination):
+    """Plain-data description of the destination map (points, route arc, view)"""
+    map_data = []
+    for city, info in DESTINATIONS.items():
+        color = [67, 233, 123, 160] if theme == 'dark' else [0, 150, 0, 150]
+        radius = 40000
+        if destination == city:
+            color = [0, 201, 255, 200] if theme == 'dark' else [0, 114, 255, 200]
+            radius = 80000
+        map_data.append({"coords": info["coords"], "name": city, "color": color, "radius": radius})
+    map_data.append({"coords": list(user_coords), "name": f"{user_location} (Home)", "color": [255, 100, 100, 200], "radius": 50000})
+
+    route_data = None
+    if destination in DESTINATIONS:
+        dest_coords = DESTINATIONS[destination]["coords"]
+        route_data = [{"from": list(user_coords), "to": dest_coords, "name": f"{user_location} → {destination}"}]
+        view = ((user_coords[1] + dest_coords[1]) / 2, (user_coords[0] + dest_coords[0]) / 2, 4.0)
+    else:
+        view = (22.0, 79.0, 3.5)
+    return {"points": map_data, "route": route_data, "view": view}
+
 # ============================================
 # 5. SIDEBAR & THEME INIT
 # ============================================
@@ -140,10 +267,9 @@ def apply_theme(theme):
         return """
         <style>
             .stApp {
-                background: linear-gradient(rgba(0, 20, 10, 0.7), rgba(0, 10, 5, 0.8)), 
-                            url('https://images.unsplash.com/photo-1511497584788-876760111969?q=80&w=2670&auto=format&fit=crop');
                 background-size: cover; background-attachment: fixed; color: #e0e0e0;
             }
+            """ + assets.background_css("bg_dark", overlay="linear-gradient(rgba(0, 20, 10, 0.7), rgba(0, 10, 5, 0.8))") + """
             section[data-testid="stSidebar"] { background: rgba(10, 25, 15, 0.6) !important; border-right: 1px solid rgba(100, 255, 140, 0.1); }
             section[data-testid="stSidebar"] * { color: #e0e0e0 !important; }
             .glass-card { background: rgba(20, 30, 25, 0.75); border: 1px solid rgba(100, 255, 140, 0.15); border-radius: 20px; padding: 24px; margin-bottom: 24px; }
@@ -161,10 +287,9 @@ def apply_theme(theme):
         return """
         <style>
             .stApp {
-                background: linear-gradient(rgba(255, 255, 255, 0.85), rgba(255, 255, 255, 0.9)), 
-                            url('https://images.unsplash.com/photo-1472214103451-9374bd1c798e?q=80&w=2070&auto=format&fit=crop');
                 background-size: cover; background-attachment: fixed; color: #000000; 
             }
+            """ + assets.background_css("bg_light", overlay="linear-gradient(rgba(255, 255, 255, 0.85), rgba(255, 255, 255, 0.9))") + """
             section[data-testid="stSidebar"] { background: rgba(255, 255, 255, 0.95) !important; border-right: 1px solid #ccc; }
             section[data-testid="stSidebar"] h1, section[data-testid="stSidebar"] label, section[data-testid="stSidebar"] p, section[data-testid="stSidebar"] span, section[data-testid="stSidebar"] div { color: #000000 !important; }
             .glass-card { background: rgba(255, 255, 255, 0.95); border: 1px solid #aaa; border-radius: 20px; padding: 24px; margin-bottom: 24px; box-shadow: 0 4px 15px rgba(0,0,0,0.1); }
@@ -219,7 +344,7 @@ with st.sidebar:
     st.markdown("---")
     if destination != "Select a destination":
         dest_coords = DESTINATIONS[destination]["coords"]
-        distance = calculate_distance(st.session_state.user_coords, dest_coords)
+        distance = cached_distance(st.session_state.user_coords, dest_coords)
         st.markdown(f"""
         <div style="background: rgba(56, 239, 125, 0.1); padding: 15px; border-radius: 10px; margin: 15px 0; border: 1px solid rgba(56, 239, 125, 0.3);">
             <p style="margin: 0; font-size: 0.9rem; color: #e0e0e0;">
@@ -230,8 +355,17 @@ with st.sidebar:
         """, unsafe_allow_html=True)
         
         st.markdown("### 👥 Trip Details")
-        travelers = st.slider("Number of travelers", 1, 10, 2)
+        group_mode = st.checkbox("🚌 Large group (mixed fleet)", help="Corporate & school groups: split the party across cars, minibuses, buses and train seats.")
+        if group_mode:
+            travelers = st.number_input("Group size", 11, group_planner.MAX_GROUP_SIZE, 40, step=1)
+            group_objective_label = st.radio("Optimise fleet for", ["🌿 Lowest CO₂", "💰 Lowest Cost"], horizontal=True)
+            group_objective = "co2" if group_objective_label == "🌿 Lowest CO₂" else "cost"
+            group_budget = st.number_input("Transport budget (₹, 0 = no limit)", 0, 10000000, 0, step=5000)
+        else:
+            travelers = st.slider("Number of travelers", 1, 10, 2)
         days = st.slider("Duration (days)", 1, 30, 5)
+        today = date.today()
+        travel_date = st.date_input("Departure date", value=today + timedelta(days=14), min_value=today, max_value=today + timedelta(days=365))
         st.markdown("---")
         st.markdown("### 🚗 Your Travel Plan")
         col1, col2 = st.columns(2)
@@ -272,12 +406,12 @@ header_html = f"""
 st.markdown(header_html, unsafe_allow_html=True)
 
 # --- INFO SECTION ---
-st.markdown("""
+st.markdown(f"""
 <div class="glass-card" style="margin-top: 20px;">
     <h3>🌱 What is Eco Vihari?</h3>
     <p>
         This dashboard helps conscious travelers minimize their carbon footprint while maximizing savings.
-        By analyzing distances between <strong>50+ Indian cities</strong> and <strong>23 top destinations</strong>,
+        By analyzing distances between <strong>{len(INDIAN_CITIES)} Indian cities</strong> and <strong>{len(DESTINATIONS)} top destinations</strong>,
         we calculate the environmental impact of Flights, Trains, Buses, and Personal Vehicles.
     </p>
     <ul style="list-style-type: none; padding-left: 0;">
@@ -291,37 +425,22 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+impact_stats = impact_log.get_log().summary()
 col1, col2, col3 = st.columns([2, 1, 1])
 with col1: st.markdown(f"""<div class="metric-card" style="border-left-color: #00C9FF;"><div class="metric-value">{len(DESTINATIONS)}</div><div class="metric-label">DESTINATIONS</div></div>""", unsafe_allow_html=True)
 with col2: st.markdown(f"""<div class="metric-card" style="border-left-color: #43e97b;"><div class="metric-value">{len(INDIAN_CITIES)}</div><div class="metric-label">CITIES</div></div>""", unsafe_allow_html=True)
-with col3: st.markdown(f"""<div class="metric-card" style="border-left-color: #FF6B6B;"><div class="metric-value">5,000+</div><div class="metric-label">TREES SAVED</div></div>""", unsafe_allow_html=True)
+with col3: st.markdown(f"""<div class="metric-card" style="border-left-color: #FF6B6B;"><div class="metric-value">{impact_stats['trees_saved']:,}</div><div class="metric-label">TREES SAVED</div></div>""", unsafe_allow_html=True)
 st.markdown("---")
 
 # --- MAP ---
 st.markdown("### 🗺️ Destination Network")
-map_data = []
-for city, info in DESTINATIONS.items():
-    color = [67, 233, 123, 160] if st.session_state.theme == 'dark' else [0, 150, 0, 150]
-    radius = 40000
-    if destination == city:
-        color = [0, 201, 255, 200] if st.session_state.theme == 'dark' else [0, 114, 255, 200]
-        radius = 80000
-    map_data.append({"coords": info["coords"], "name": city, "color": color, "radius": radius})
-
-map_data.append({"coords": st.session_state.user_coords, "name": f"{st.session_state.user_location} (Home)", "color": [255, 100, 100, 200], "radius": 50000})
-layers = [pdk.Layer("ScatterplotLayer", data=map_data, get_position='coords', get_color='color', get_radius='radius', pickable=True)]
-
-if destination != "Select a destination":
-    route_data = [{"from": st.session_state.user_coords, "to": DESTINATIONS[destination]["coords"], "name": f"{st.session_state.user_location} → {destination}"}]
-    layers.append(pdk.Layer("ArcLayer", data=route_data, get_source_position="from", get_target_position="to", get_source_color=[255, 100, 100], get_target_color=[0, 201, 255], get_width=6, get_tilt=15))
-
-if destination != "Select a destination":
-    dest_coords = DESTINATIONS[destination]["coords"]
-    center_lat = (st.session_state.user_coords[1] + dest_coords[1]) / 2
-    center_lon = (st.session_state.user_coords[0] + dest_coords[0]) / 2
-    zoom = 4.0
-else:
-    center_lat, center_lon, zoom = 22.0, 79.0, 3.5
+map_spec = route_cache.get_or_compute(
+    "map", CATALOG_VERSION, (st.session_state.theme, st.session_state.user_location, tuple(st.session_state.user_coords), destination),
+    lambda: build_map_spec(st.session_state.theme, st.session_state.user_location, st.session_state.user_coords, destination))
+layers = [pdk.Layer("ScatterplotLayer", data=map_spec["points"], get_position='coords', get_color='color', get_radius='radius', pickable=True)]
+if map_spec["route"]:
+    layers.append(pdk.Layer("ArcLayer", data=map_spec["route"], get_source_position="from", get_target_position="to", get_source_color=[255, 100, 100], get_target_color=[0, 201, 255], get_width=6, get_tilt=15))
+center_lat, center_lon, zoom = map_spec["view"]
 
 # Determine style based on theme
 # We use 'dark_no_labels' or 'light_no_labels' which Streamlit handles automatically without extra tokens
@@ -335,66 +454,17 @@ st.pydeck_chart(pdk.Deck(
 ))
 # --- CALCULATION RESULTS ---
 if destination != "Select a destination" and 'calculate_clicked' in locals() and calculate_clicked:
-    dest_info = DESTINATIONS[destination]
     try:
-        distance = calculate_distance(st.session_state.user_coords, dest_info["coords"])
-        car_speed_avg = 60
-        car_time_hours = int(distance / car_speed_avg)
-        car_time_str = f"{car_time_hours}h {int((distance % car_speed_avg))}m"
-        base_delhi_distance = dest_info["distance"]
-        distance_ratio = distance / base_delhi_distance if base_delhi_distance > 0 else 1
-        
-        transport_options_map = {
-            "Flight": {"name": dest_info["flight"]["name"], "price_per_person": int(dest_info["flight"]["price"] * distance_ratio), "co2_per_person": int(dest_info["flight"]["co2"] * distance_ratio), "time": dest_info["flight"]["time"], "type": "Flight"},
-            "Train": {"name": dest_info["train"]["name"], "price_per_person": int(dest_info["train"]["price"] * distance_ratio), "co2_per_person": int(dest_info["train"]["co2"] * distance_ratio), "time": dest_info["train"]["time"], "type": "Train"},
-            "Bus": {"name": dest_info["bus"]["name"], "price_per_person": int(dest_info["bus"]["price"] * distance_ratio), "co2_per_person": int(dest_info["bus"]["co2"] * distance_ratio), "time": dest_info["bus"]["time"], "type": "Bus"},
-            "Car (Personal)": {"name": "Personal Vehicle", "price_total_trip": distance * 15, "price_is_per_person": False, "co2_total_trip": distance * 0.15, "co2_is_per_person": False, "time": car_time_str, "type": "Car (Personal)"},
-            "Car (Taxi/Rental)": {"name": "Taxi / Rental", "price_total_trip": distance * 22, "price_is_per_person": False, "co2_total_trip": distance * 0.15, "co2_is_per_person": False, "time": car_time_str, "type": "Car (Taxi/Rental)"}
-        }
-        
-        user_trans_data = transport_options_map[transport]
-        if user_trans_data.get("price_is_per_person", True):
-            transport_cost = user_trans_data["price_per_person"] * travelers
-            transport_co2 = user_trans_data["co2_per_person"] * travelers
-        else:
-            vehicles_needed = np.ceil(travelers / 4)
-            transport_cost = user_trans_data["price_total_trip"] * vehicles_needed
-            transport_co2 = user_trans_data["co2_total_trip"] * vehicles_needed
-        transport_name = user_trans_data["name"]
-
-        stay_cost = ACCOMMODATION_OPTIONS[stay]["price"] * days
-        stay_co2 = ACCOMMODATION_OPTIONS[stay]["co2"] * days
-        food_cost = FOOD_OPTIONS[food]["price"] * days * travelers
-        food_co2 = FOOD_OPTIONS[food]["co2"] * days * travelers
-        user_total_cost = transport_cost + stay_cost + food_cost
-        user_total_co2 = transport_co2 + stay_co2 + food_co2
-        
-        all_combinations = []
-        for t_key, t_data in transport_options_map.items():
-            for s_key, s_data in ACCOMMODATION_OPTIONS.items():
-                if stay != "With Relatives" and s_key == "With Relatives": continue
-                if stay == "With Relatives" and s_key != "With Relatives": continue
-                for f_key, f_data in FOOD_OPTIONS.items():
-                    if food != "With Relatives" and f_key == "With Relatives": continue
-                    if food == "With Relatives" and f_key != "With Relatives": continue
-                    if t_data.get("price_is_per_person", True):
-                        t_c = t_data["price_per_person"] * travelers
-                        t_e = t_data["co2_per_person"] * travelers
-                    else:
-                        v_n = np.ceil(travelers / 4)
-                        t_c = t_data["price_total_trip"] * v_n
-                        t_e = t_data["co2_total_trip"] * v_n
-                    s_c = s_data["price"] * days
-                    s_e = s_data["co2"] * days
-                    f_c = f_data["price"] * days * travelers
-                    f_e = f_data["co2"] * days * travelers
-                    tot_c = t_c + s_c + f_c
-                    tot_e = t_e + s_e + f_e
-                    eco_score = (tot_c / 1000) + (tot_e * 0.5)
-                    all_combinations.append({"transport": t_key, "stay": s_key, "food": f_key, "total_cost": tot_c, "total_co2": tot_e, "transport_name": t_data["name"], "transport_cost": t_c, "stay_cost": s_c, "food_cost": f_c, "eco_score": eco_score})
-        
-        all_combinations.sort(key=lambda x: x["eco_score"])
-        best_eco_combinations = all_combinations[:3] if all_combinations else [all_combinations[0]]
+        route = route_cache.get_or_compute(
+            "route", CATALOG_VERSION, (tuple(st.session_state.user_coords), destination, travelers, days, transport, stay, food, str(travel_date), str(today)),
+            lambda: compute_route_results(st.session_state.user_coords, destination, travelers, days, transport, stay, food, travel_date, today))
+        distance = route["distance"]
+        transport_options_map = route["transport_options_map"]
+        transport_cost, transport_co2, transport_name = route["transport_cost"], route["transport_co2"], route["transport_name"]
+        stay_cost, food_cost = route["stay_cost"], route["food_cost"]
+        user_total_cost, user_total_co2 = route["user_total_cost"], route["user_total_co2"]
+        best_eco_combinations = route["best_eco_combinations"]
+        display_options = route["display_options"]
         eco_combo = best_eco_combinations[0]
         
         user_is_already_eco = (eco_combo["transport"] == transport and eco_combo["stay"] == stay and eco_combo["food"] == food)
@@ -418,7 +488,15 @@ if destination != "Select a destination" and 'calculate_clicked' in locals() and
             
         trees_needed = user_total_co2 / 21 if user_total_co2 > 0 else 0
         trees_for_offset = int(trees_needed/21) if trees_needed > 0 else 0
+
+        impact_log.log_calculation(
+            origin=st.session_state.user_location, destination=destination, travelers=travelers, days=days,
+            plan={"transport": transport, "stay": stay, "food": food, "total_cost": float(user_total_cost), "total_co2": float(user_total_co2)},
+            eco_plan={"transport": eco_transport, "stay": eco_stay, "food": eco_food, "total_cost": float(eco_total_cost), "total_co2": float(eco_total_co2)},
+            co2_savings=co2_savings, savings=savings, percent_reduction=percent_reduction, trees_for_offset=trees_for_offset,
+            username=st.session_state.get("username", ""))
         
+        eco_assistant_icon = assets.asset_url("eco_assistant", 120)
         st.markdown("---")
         st.markdown(f"### 📊 Analysis Results: {st.session_state.user_location} → {destination}")
         col1, col2, col3 = st.columns(3)
@@ -427,9 +505,9 @@ if destination != "Select a destination" and 'calculate_clicked' in locals() and
         with col3: st.markdown(f"""<div class="metric-card" style="border-left-color: #FFD166;"><div class="metric-value">{days}</div><div class="metric-label">DAYS</div></div>""", unsafe_allow_html=True)
         
         if user_is_already_eco:
-            st.markdown(f"""<div style="display:flex; align-items:center; margin: 20px 0; background: rgba(67, 233, 123, 0.2); padding: 15px; border-radius: 12px; border: 1px solid #43e97b;"><img src="https://cdn-icons-png.flaticon.com/512/3135/3135715.png" width="60" style="border-radius:50%; margin-right: 15px;"><div><strong>🌿 Eco Assistant:</strong> "Excellent! Your trip is already optimal! You're generating only <strong style='color:#43e97b'>{user_total_co2:.0f} kg CO₂</strong>. Have a safe and sustainable journey!"</div></div>""", unsafe_allow_html=True)
+            st.markdown(f"""<div style="display:flex; align-items:center; margin: 20px 0; background: rgba(67, 233, 123, 0.2); padding: 15px; border-radius: 12px; border: 1px solid #43e97b;"><img src="{eco_assistant_icon}" width="60" style="border-radius:50%; margin-right: 15px;"><div><strong>🌿 Eco Assistant:</strong> "Excellent! Your trip is already optimal! You're generating only <strong style='color:#43e97b'>{user_total_co2:.0f} kg CO₂</strong>. Have a safe and sustainable journey!"</div></div>""", unsafe_allow_html=True)
         else:
-            st.markdown(f"""<div style="display:flex; align-items:center; margin: 20px 0; background: rgba(255, 100, 100, 0.1); padding: 15px; border-radius: 12px; border: 1px solid rgba(255,100,100,0.3);"><img src="https://cdn-icons-png.flaticon.com/512/3135/3135715.png" width="60" style="border-radius:50%; margin-right: 15px;"><div><strong>🌿 Eco Assistant:</strong> "Your current plan generates <strong style='color:#ff6b6b'>{user_total_co2:.0f} kg CO₂</strong>. Consider the eco-alternative below to save <strong style='color:#43e97b'>₹{savings:,}</strong>!"</div></div>""", unsafe_allow_html=True)
+            st.markdown(f"""<div style="display:flex; align-items:center; margin: 20px 0; background: rgba(255, 100, 100, 0.1); padding: 15px; border-radius: 12px; border: 1px solid rgba(255,100,100,0.3);"><img src="{eco_assistant_icon}" width="60" style="border-radius:50%; margin-right: 15px;"><div><strong>🌿 Eco Assistant:</strong> "Your current plan generates <strong style='color:#ff6b6b'>{user_total_co2:.0f} kg CO₂</strong>. Consider the eco-alternative below to save <strong style='color:#43e97b'>₹{savings:,}</strong>!"</div></div>""", unsafe_allow_html=True)
         
         col1, col2 = st.columns(2)
         with col1:
@@ -459,18 +537,6 @@ if destination != "Select a destination" and 'calculate_clicked' in locals() and
         st.markdown("---")
         st.markdown("### 🚌 Alternative Transport Options")
         cols = st.columns(5)
-        display_options = []
-        for t_key in ["Flight", "Train", "Bus", "Car (Personal)", "Car (Taxi/Rental)"]:
-            data = transport_options_map[t_key]
-            if data.get("price_is_per_person", True):
-                p = data["price_per_person"] * travelers
-                c = data["co2_per_person"] * travelers
-            else:
-                v_n = np.ceil(travelers / 4)
-                p = data["price_total_trip"] * v_n
-                c = data["co2_total_trip"] * v_n
-            display_options.append({"key": t_key, "data": data, "p": p, "c": c})
-        
         for idx, item in enumerate(display_options):
             mode = item["key"]
             data = item["data"]
@@ -482,6 +548,38 @@ if destination != "Select a destination" and 'calculate_clicked' in locals() and
                 html_content = f"""<div style="border: 1px solid {border_color}; background: {bg_color}; border-radius: 12px; padding: 15px; min-height: 150px; display: flex; flex-direction: column; justify-content: space-between;"><div style="display: flex; justify-content: space-between; align-items: center;"><span style="font-weight:bold; font-size: 0.9rem; color: #e0e0e0;">{mode}</span>{'✅' if is_recommended else '📌' if is_current else ''}</div><p style="margin: 10px 0 5px 0; font-size: 0.8rem; color: #aaa;">{data["name"]}</p><div style="font-size: 0.8rem; color: #e0e0e0;">Price: ₹{item["p"]:,.0f}<br>CO₂: {item["c"]:.0f}kg</div><div style="margin-top: 10px; font-size: 0.75rem; color: #888;">⏱️ {data["time"]}</div></div>"""
                 st.markdown(html_content, unsafe_allow_html=True)
 
+        st.markdown("---")
+        st.markdown(f"### 📅 Cheapest Green Date (next {fares.SCAN_DAYS} days)")
+        green_dates = route_cache.get_or_compute(
+            "green_dates", CATALOG_VERSION, (tuple(st.session_state.user_coords), destination, travelers, str(today)),
+            lambda: fares.cheapest_green_dates(destination, route["base_fares"], travelers, today, booked_on=today))
+        if green_dates.empty:
+            st.info("No train or bus service is listed for this route.")
+        else:
+            best_day = green_dates.loc[green_dates["total_price"].idxmin()]
+            chosen_day = green_dates[green_dates["date"] == pd.Timestamp(travel_date)]
+            chosen_text = f" vs. ₹{chosen_day['total_price'].iloc[0]:,} on your date ({travel_date.strftime('%d %b')})" if not chosen_day.empty else ""
+            st.markdown(f"""<div class="glass-card"><p style="margin: 0;">🌿 Go by <strong>{best_day['mode']}</strong> ({best_day['name']}) on <strong>{best_day['date'].strftime('%a, %d %b %Y')}</strong>: <strong>₹{best_day['total_price']:,}</strong> • <strong>{best_day['total_co2']:.0f} kg CO₂</strong> for {travelers} travelers{chosen_text}</p></div>""", unsafe_allow_html=True)
+            date_fig = go.Figure()
+            date_fig.add_trace(go.Scatter(x=green_dates["date"], y=green_dates["total_price"], name='Cheapest green fare (₹)', mode='lines', line=dict(width=3, color=eco_color), customdata=green_dates["mode"], hovertemplate='%{x|%d %b}: ₹%{y:,} by %{customdata}<extra></extra>'))
+            date_fig.add_trace(go.Scatter(x=[best_day["date"]], y=[best_day["total_price"]], name='Cheapest day', mode='markers', marker=dict(size=14, color=line_color, symbol='star')))
+            date_fig.update_layout(template='plotly_dark' if st.session_state.theme == 'dark' else 'plotly_white', plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', xaxis=dict(title='Departure Date'), yaxis=dict(title='Total Fare (₹)'), legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='center', x=0.5), height=320, margin=dict(l=20, r=20, t=40, b=20))
+            st.plotly_chart(date_fig, use_container_width=True)
+
+        if group_mode:
+            st.markdown("---")
+            st.markdown("### 🚐 Group Fleet Plan")
+            fleet_plan = group_planner.plan_group_trip(travelers, distance, transport_options_map, objective=group_objective, budget=group_budget or None)
+            if fleet_plan is None:
+                st.warning(f"No fleet mix can move {travelers} travelers within ₹{group_budget:,}. Try raising the budget.")
+            else:
+                st.markdown(f"""<div class="glass-card"><p style="margin: 0 0 10px 0;">Best mix for <strong>{travelers}</strong> travelers ({'lowest CO₂' if group_objective == 'co2' else 'lowest cost'}): <strong>₹{fleet_plan['total_cost']:,.0f}</strong> • <strong>{fleet_plan['total_co2']:.0f} kg CO₂</strong></p><p style="margin: 0; font-size: 0.9rem; color: #aaa;">vs. all by {transport}: ₹{transport_cost:,.0f} • {transport_co2:.0f} kg CO₂</p></div>""", unsafe_allow_html=True)
+                cols = st.columns(max(len(fleet_plan["allocation"]), 1))
+                for idx, unit in enumerate(fleet_plan["allocation"]):
+                    with cols[idx]:
+                        unit_label = "seats" if unit["seats"] == unit["units"] else "vehicles"
+                        st.markdown(f"""<div style="border: 1px solid #43e97b; background: rgba(67, 233, 123, 0.1); border-radius: 12px; padding: 15px; min-height: 150px;"><span style="font-weight:bold; font-size: 0.9rem; color: #e0e0e0;">{unit["name"]}</span><p style="margin: 10px 0 5px 0; font-size: 0.8rem; color: #aaa;">{unit["units"]} {unit_label} • {unit["travelers"]} travelers</p><div style="font-size: 0.8rem; color: #e0e0e0;">Price: ₹{unit["cost"]:,.0f}<br>CO₂: {unit["co2"]:.0f}kg</div></div>""", unsafe_allow_html=True)
+
         st.markdown("---")
         st.markdown("### 🔄 More Eco Options")
         st.markdown("#### 🌟 Top 3 Eco-Friendly Combinations")
@@ -546,10 +644,10 @@ else:
     st.markdown("---")
     st.markdown("### 📊 Quick Statistics")
     c1, c2, c3, c4 = st.columns(4)
-    with c1: st.markdown("""<div class="metric-card"><div class="metric-value">23</div><div class="metric-label">DESTINATIONS</div></div>""", unsafe_allow_html=True)
-    with c2: st.markdown("""<div class="metric-card"><div class="metric-value">50+</div><div class="metric-label">CITIES</div></div>""", unsafe_allow_html=True)
-    with c3: st.markdown("""<div class="metric-card"><div class="metric-value">25%</div><div class="metric-label">AVG SAVINGS</div></div>""", unsafe_allow_html=True)
-    with c4: st.markdown("""<div class="metric-card"><div class="metric-value">5,000</div><div class="metric-label">TREES SAVED</div></div>""", unsafe_allow_html=True)
+    with c1: st.markdown(f"""<div class="metric-card"><div class="metric-value">{impact_stats['destinations_explored']}/{len(DESTINATIONS)}</div><div class="metric-label">DESTINATIONS EXPLORED</div></div>""", unsafe_allow_html=True)
+    with c2: st.markdown(f"""<div class="metric-card"><div class="metric-value">{impact_stats['calculations']:,}</div><div class="metric-label">TRIPS PLANNED</div></div>""", unsafe_allow_html=True)
+    with c3: st.markdown(f"""<div class="metric-card"><div class="metric-value">{impact_stats['avg_percent_reduction']:.0f}%</div><div class="metric-label">AVG SAVINGS</div></div>""", unsafe_allow_html=True)
+    with c4: st.markdown(f"""<div class="metric-card"><div class="metric-value">{impact_stats['trees_saved']:,}</div><div class="metric-label">TREES SAVED</div></div>""", unsafe_allow_html=True)
 
 # ============================================
 # 11. FOOTER
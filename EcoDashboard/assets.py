@@ -0,0 +1,205 @@
+import os
+import sys
+import json
+import base64
+import urllib.request
+from functools import lru_cache
+
+# --- ASSET SETTINGS ---
+# Built variants live in static/ and are served by Streamlit at app/static/<file>
+# (`server.enableStaticServing = true` in .streamlit/config.toml, the default setup).
+# Without static serving they are inlined as data URIs, which ride along with every
+# rerun, so inline mode always uses the smallest background variant.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+SOURCE_DIR = os.path.join(BASE_DIR, "asset_sources")   # optional hand-placed originals for offline builds
+MANIFEST_FILE = os.path.join(STATIC_DIR, "assets.json")
+SMALL_SCREEN_PX = 900
+
+ASSETS = {
+    "bg_dark": {"url": "https://images.unsplash.com/photo-1511497584788-876760111969?q=80&w=2670&auto=format&fit=crop", "widths": [960, 1600], "quality": 55},
+    "bg_light": {"url": "https://images.unsplash.com/photo-1472214103451-9374bd1c798e?q=80&w=2070&auto=format&fit=crop", "widths": [960, 1600], "quality": 55},
+    "bg_login": {"url": "https://images.unsplash.com/photo-1518173946687-a4c8892bbd9f?q=80&w=2574&auto=format&fit=crop", "widths": [960, 1600], "quality": 55},
+    # Shown at 60px, so 120px covers 2x displays
+    "eco_assistant": {"url": "https://cdn-icons-png.flaticon.com/512/3135/3135715.png", "widths": [120], "quality": 80},
+}
+
+# Images each page needs on its first load, used by the page-weight report
+PAGES = {
+    "Login": ["bg_login"],
+    "Dashboard (dark)": ["bg_dark"],
+    "Dashboard (light)": ["bg_light"],
+    "Results (dark)": ["bg_dark", "eco_assistant"],
+}
+
+
+def variant_file(name, width):
+    return f"{name}-{width}.webp"
+
+
+def _variant_path(name, width):
+    return os.path.join(STATIC_DIR, variant_file(name, width))
+
+
+def _pick_width(name, width=None):
+    # Smallest built variant that is at least `width`, else the largest one we have
+    built = [w for w in sorted(ASSETS[name]["widths"]) if os.path.exists(_variant_path(name, w))]
+    if not built:
+        return None
+    if width is None:
+        return built[-1]
+    for w in built:
+        if w >= width:
+            return w
+    return built[-1]
+
+
+def _static_serving():
+    try:
+        import streamlit as st
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+@lru_cache(maxsize=None)
+def _data_uri(path):
+    with open(path, "rb") as f:
+        return "data:image/webp;base64," + base64.b64encode(f.read()).decode("ascii")
+
+
+def asset_url(name, width=None):
+    """URL for a bundled image: static route, cached data URI, or the original remote URL if not built"""
+    w = _pick_width(name, width)
+    if w is None:
+        return ASSETS[name]["url"]
+    if _static_serving():
+        return f"app/static/{variant_file(name, w)}"
+    return _data_uri(_variant_path(name, w))
+
+
+def background_css(name, overlay=None):
+    """`.stApp` background-image rule: full size plus a small-screen variant when served statically"""
+    layers = f"{overlay}, " if overlay else ""
+    if not _static_serving():
+        # The <style> block is re-sent on every rerun, so keep the inlined image small
+        return f".stApp {{ background-image: {layers}url('{asset_url(name, SMALL_SCREEN_PX)}'); }}"
+    css = f".stApp {{ background-image: {layers}url('{asset_url(name, 1600)}'); }}"
+    small = _pick_width(name, SMALL_SCREEN_PX)
+    if small is not None and small != _pick_width(name, 1600):
+        css += f"\n@media (max-width: {SMALL_SCREEN_PX}px) {{ .stApp {{ background-image: {layers}url('{asset_url(name, SMALL_SCREEN_PX)}'); }} }}"
+    return css
+
+
+# --- BUILD PIPELINE ---
+def _load_source(name):
+    for ext in (".jpg", ".jpeg", ".png", ".webp"):
+        path = os.path.join(SOURCE_DIR, name + ext)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return os.path.relpath(path, BASE_DIR), f.read()
+    req = urllib.request.Request(ASSETS[name]["url"], headers={"User-Agent": "EcoVihari-assets"})
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return ASSETS[name]["url"], resp.read()
+
+
+def build_assets():
+    """Fetch each original once, downscale to every width and save as WebP (needs Pillow)"""
+    try:
+        from PIL import Image
+    except ImportError:
+        sys.exit("Pillow is required to build assets: pip install pillow")
+    import io
+
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    manifest = {}
+    for name, spec in ASSETS.items():
+        source, raw = _load_source(name)
+        image = Image.open(io.BytesIO(raw))
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+        manifest[name] = {"source": source, "source_url": spec["url"], "source_bytes": len(raw), "variants": {}}
+        for width in spec["widths"]:
+            variant = image
+            if image.width > width:
+                height = round(image.height * width / image.width)
+                variant = image.resize((width, height), Image.LANCZOS)
+            path = _variant_path(name, width)
+            variant.save(path, "WEBP", quality=spec["quality"], method=6)
+            manifest[name]["variants"][str(width)] = os.path.getsize(path)
+            print(f"  {variant_file(name, width):<28} {os.path.getsize(path):>9,} bytes")
+    with open(MANIFEST_FILE, "w") as f:
+        json.dump(manifest, f, indent=2)
+    _data_uri.cache_clear()
+
+
+# --- PAGE WEIGHT REPORT ---
+def _page_bytes(name, inline):
+    # Mirrors what background_css/asset_url pick for a desktop client
+    if name.startswith("bg_"):
+        width = SMALL_SCREEN_PX if inline else 1600
+    else:
+        width = None
+    w = _pick_width(name, width)
+    if w is None:
+        return None
+    size = os.path.getsize(_variant_path(name, w))
+    # base64 adds a third on top of the raw bytes
+    return (size + 2) // 3 * 4 if inline else size
+
+
+def page_weight_report(inline=None):
+    """Image bytes per page on first load and on every rerun after it"""
+    manifest = {}
+    if os.path.exists(MANIFEST_FILE):
+        with open(MANIFEST_FILE, "r") as f:
+            manifest = json.load(f)
+    if inline is None:
+        inline = not _static_serving()
+    rows = []
+    for page, names in PAGES.items():
+        first_load = original = 0
+        missing = []
+        for name in names:
+            size = _page_bytes(name, inline)
+            if size is None:
+                missing.append(name)
+                continue
+            first_load += size
+            entry = manifest.get(name, {})
+            # Only downloaded originals say anything about the old remote page weight
+            if entry.get("source") == entry.get("source_url"):
+                original += entry.get("source_bytes", 0)
+        rows.append({
+            "page": page,
+            "first_load_bytes": first_load,
+            # Inline images are part of the markdown Streamlit re-sends on each rerun;
+            # static files are cached by the browser after the first load
+            "per_rerun_bytes": first_load if inline else 0,
+            "original_bytes": original or None,
+            "missing": missing,
+        })
+    return rows
+
+
+def print_report(inline=None):
+    if inline is None:
+        inline = not _static_serving()
+    print(f"Image weight per page ({'inline data URIs' if inline else 'static files'}):")
+    print(f"  {'Page':<20} {'First load':>12} {'Per rerun':>12} {'Remote orig.':>13}")
+    for row in page_weight_report(inline):
+        note = f"  (not built: {', '.join(row['missing'])})" if row["missing"] else ""
+        original = f"{row['original_bytes']:,}" if row["original_bytes"] else "n/a"
+        print(f"  {row['page']:<20} {row['first_load_bytes']:>12,} {row['per_rerun_bytes']:>12,} {original:>13}{note}")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "report"
+    modes = {"static": False, "inline": True}
+    if command == "build":
+        build_assets()
+        print_report(False)
+        print_report(True)
+    elif command == "report" and (len(sys.argv) < 3 or sys.argv[2] in modes):
+        print_report(modes.get(sys.argv[2]) if len(sys.argv) > 2 else None)
+    else:
+        print("usage: python assets.py build | report [static|inline]")
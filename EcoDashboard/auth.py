@@ -4,6 +4,7 @@ import os
 import hashlib
 import time
 import random
+import assets
 
 # --- USER DATABASE FILE ---
 USER_DB_FILE = "users.json"
@@ -58,11 +59,11 @@ def show_login_page():
     <style>
         /* Main Background */
         .stApp {
-            background: url('https://images.unsplash.com/photo-1518173946687-a4c8892bbd9f?q=80&w=2574&auto=format&fit=crop');
             background-size: cover;
             background-position: center;
             background-attachment: fixed;
         }
+        """ + assets.background_css("bg_login") + """
         
         /* Hide Navbar/Sidebar */
         [data-testid="stSidebar"], header, footer { display: none !important; }
@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+from datetime import date
+from functools import lru_cache
+
+# --- FARE SETTINGS ---
+# Base prices in DESTINATIONS are treated as "normal demand" fares. Each route gets a
+# demand calendar; demand moves fares (by mode sensitivity) and load factors, and the
+# load factor moves CO2 per passenger (a half-empty bus emits more per seat).
+FARE_MODES = ["Flight", "Train", "Bus"]
+GREEN_MODES = ["Train", "Bus"]
+FARE_SENSITIVITY = {"Flight": 1.0, "Train": 0.4, "Bus": 0.6}
+BASE_LOAD = {"Flight": 0.80, "Train": 0.85, "Bus": 0.70}
+LOAD_SENSITIVITY = 0.4
+SCAN_DAYS = 60
+
+DESTINATION_TYPE = {
+    "Manali": "hills", "Shimla": "hills", "Rishikesh": "hills", "Leh": "hills", "Srinagar": "hills",
+    "Darjeeling": "hills", "Gangtok": "hills", "Ooty": "hills", "Munnar": "hills",
+    "Goa": "beach", "Kochi": "beach", "Pondicherry": "beach",
+    "Jaipur": "heritage", "Udaipur": "heritage", "Jaisalmer": "heritage", "Agra": "heritage",
+    "Varanasi": "heritage", "Amritsar": "heritage",
+}
+
+# (start MM-DD, end MM-DD inclusive, demand); overlapping windows add up, windows may wrap the year
+SEASONS = {
+    "hills": [("04-15", "06-30", 0.45), ("07-01", "09-15", -0.25), ("12-20", "01-05", 0.30), ("01-06", "02-28", -0.15)],
+    "beach": [("11-15", "02-28", 0.35), ("06-01", "09-15", -0.30), ("12-20", "01-05", 0.30)],
+    "heritage": [("10-01", "03-15", 0.25), ("04-15", "07-31", -0.25)],
+    "metro": [("05-01", "06-15", 0.10), ("07-15", "09-15", -0.10)],
+}
+FESTIVALS = [("10-20", "11-15", 0.25), ("12-22", "01-02", 0.20)]
+
+# Late booking: flights climb as exp(-lead/decay); trains (Tatkal) and buses take a flat
+# premium inside the last few days
+FLIGHT_LATE_PREMIUM = 0.6
+FLIGHT_LATE_DECAY_DAYS = 10
+LATE_BOOKING_STEP = {"Train": (1, 1.3), "Bus": (2, 1.1)}   # mode: (days before departure, multiplier)
+WEEKDAY_SURCHARGE = {"Flight": 0.08, "Bus": 0.05}
+SURCHARGE_WEEKDAYS = (4, 6)                                 # Friday, Sunday
+
+# Everything that shapes a quote; hashed into the shared cache keys so edits invalidate them
+PRICING_TABLES = (
+    DESTINATION_TYPE, SEASONS, FESTIVALS, FARE_SENSITIVITY, BASE_LOAD, LOAD_SENSITIVITY,
+    FLIGHT_LATE_PREMIUM, FLIGHT_LATE_DECAY_DAYS, LATE_BOOKING_STEP, WEEKDAY_SURCHARGE, SURCHARGE_WEEKDAYS,
+)
+
+
+# --- CALENDAR BUILD ---
+def _window_mask(days, start, end):
+    # days are datetime64[D]; compare on MM-DD so windows repeat every year
+    md = pd.DatetimeIndex(days).strftime("%m-%d").to_numpy()
+    if start <= end:
+        return (md >= start) & (md <= end)
+    return (md >= start) | (md <= end)
+
+
+def _compress(days, values):
+    # Run-length encode a daily series into [start, next_start) intervals
+    change = np.ones(len(values), dtype=bool)
+    change[1:] = np.any(values[1:] != values[:-1], axis=1)
+    starts = days[change]
+    ends = np.append(starts[1:], days[-1] + np.timedelta64(1, "D"))
+    return starts, ends, values[change]
+
+
+def fare_table(year=None):
+    """
+    Interval-indexed fare calendar for every route and mode, covering `year` and the next one.
+
+    One row per (destination, mode, interval) with columns fare_mult and load_factor.
+    The year is resolved before the cached build, so long-running servers roll over.
+    """
+    return _fare_table(year or date.today().year)
+
+
+@lru_cache(maxsize=4)
+def _fare_table(year):
+    days = np.arange(np.datetime64(f"{year}-01-01"), np.datetime64(f"{year + 2}-01-01"), dtype="datetime64[D]")
+    masks = {}
+
+    def mask(start, end):
+        if (start, end) not in masks:
+            masks[(start, end)] = _window_mask(days, start, end)
+        return masks[(start, end)]
+
+    frames = []
+    for destination in sorted(set(DESTINATION_TYPE) | {"__default__"}):
+        demand = np.zeros(len(days))
+        for start, end, level in SEASONS[DESTINATION_TYPE.get(destination, "metro")] + FESTIVALS:
+            demand += np.where(mask(start, end), level, 0.0)
+        demand = np.clip(demand, -0.4, 0.8)
+        for mode in FARE_MODES:
+            fare_mult = np.round(1 + demand * FARE_SENSITIVITY[mode], 3)
+            load = np.round(np.clip(BASE_LOAD[mode] + demand * LOAD_SENSITIVITY, 0.35, 1.0), 3)
+            starts, ends, values = _compress(days, np.column_stack([fare_mult, load]))
+            frames.append(pd.DataFrame({
+                "destination": destination, "mode": mode, "start": starts, "end": ends,
+                "fare_mult": values[:, 0], "load_factor": values[:, 1],
+            }))
+    return FareTable(pd.concat(frames, ignore_index=True))
+
+
+class FareTable:
+    """Columnar fare calendar; each (route, mode) lookup is a binary search on an IntervalIndex"""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self._series = {}
+        for (destination, mode), rows in frame.groupby(["destination", "mode"], sort=False):
+            index = pd.IntervalIndex.from_arrays(rows["start"].to_numpy(), rows["end"].to_numpy(), closed="left")
+            self._series[(destination, mode)] = (index, rows["fare_mult"].to_numpy(), rows["load_factor"].to_numpy())
+
+    def lookup(self, destination, mode, dates):
+        """fare_mult and load_factor arrays for one route/mode over any array of dates"""
+        key = (destination, mode) if (destination, mode) in self._series else ("__default__", mode)
+        index, fare_mult, load = self._series[key]
+        pos = index.get_indexer(pd.DatetimeIndex(np.atleast_1d(np.asarray(dates, dtype="datetime64[D]"))))
+        # Dates outside the calendar fall back to normal demand
+        found = pos >= 0
+        return (np.where(found, fare_mult[pos], 1.0), np.where(found, load[pos], BASE_LOAD[mode]))
+
+
+def lead_time_multiplier(mode, lead_days):
+    """Late-booking premium: flights climb steeply in the last fortnight, trains hit Tatkal"""
+    lead_days = np.maximum(np.asarray(lead_days, dtype=float), 0)
+    if mode == "Flight":
+        return 1 + FLIGHT_LATE_PREMIUM * np.exp(-lead_days / FLIGHT_LATE_DECAY_DAYS)
+    if mode in LATE_BOOKING_STEP:
+        days, multiplier = LATE_BOOKING_STEP[mode]
+        return np.where(lead_days <= days, multiplier, 1.0)
+    return np.ones_like(lead_days)
+
+
+def weekday_multiplier(mode, dates):
+    # Friday and Sunday departures carry a surcharge on flights and buses
+    weekday = pd.DatetimeIndex(np.atleast_1d(np.asarray(dates, dtype="datetime64[D]"))).dayofweek.to_numpy()
+    surcharge = WEEKDAY_SURCHARGE.get(mode, 0.0)
+    return np.where(np.isin(weekday, SURCHARGE_WEEKDAYS), 1 + surcharge, 1.0)
+
+
+def quote(destination, mode, base_price, base_co2, dates, booked_on=None):
+    """Per-person price and CO2 for departures on `dates` (vectorised over the date axis)"""
+    dates = np.atleast_1d(np.asarray(dates, dtype="datetime64[D]"))
+    booked_on = np.datetime64(booked_on or date.today(), "D")
+    fare_mult, load = fare_table().lookup(destination, mode, dates)
+    lead_days = (dates - booked_on).astype(int)
+    price = base_price * fare_mult * lead_time_multiplier(mode, lead_days) * weekday_multiplier(mode, dates)
+    co2 = base_co2 * BASE_LOAD[mode] / load
+    return price, co2
+
+
+def cheapest_green_dates(destination, transport_options_map, travelers, start=None, days=SCAN_DAYS, booked_on=None):
+    """
+    Scan the next `days` departures for the cheapest train/bus option.
+
+    `transport_options_map` holds the static per-person price/CO2 for the route (as built
+    in app.compute_route_results). Returns one row per date with the best green mode.
+    """
+    start = np.datetime64(start or date.today(), "D")
+    dates = start + np.arange(days)
+    modes = [m for m in GREEN_MODES if transport_options_map.get(m, {}).get("price_per_person", 0) > 0]
+    if not modes:
+        return pd.DataFrame(columns=["date", "mode", "name", "price_per_person", "co2_per_person", "total_price", "total_co2"])
+
+    prices, co2s = [], []
+    for mode in modes:
+        base = transport_options_map[mode]
+        price, co2 = quote(destination, mode, base["price_per_person"], base["co2_per_person"], dates, booked_on)
+        prices.append(price)
+        co2s.append(co2)
+    prices, co2s = np.vstack(prices), np.vstack(co2s)
+    best = prices.argmin(axis=0)
+    cols = np.arange(len(dates))
+    best_price, best_co2 = prices[best, cols], co2s[best, cols]
+    return pd.DataFrame({
+        "date": pd.DatetimeIndex(dates),
+        "mode": np.array(modes)[best],
+        "name": [transport_options_map[modes[i]]["name"] for i in best],
+        "price_per_person": np.round(best_price).astype(int),
+        "co2_per_person": np.round(best_co2, 1),
+        "total_price": np.round(best_price * travelers).astype(int),
+        "total_co2": np.round(best_co2 * travelers, 1),
+    })
@@ -0,0 +1,130 @@
+import math
+
+# --- FLEET SETTINGS ---
+# Chartered vehicles are billed per vehicle, so empty seats still cost money.
+# Scheduled modes (flight, train, bus) are billed per seat.
+CHARTER_VEHICLES = {
+    "Car (Taxi/Rental)": {"seats": 4, "price_per_km": 22, "co2_per_km": 0.15},
+    "Tempo Traveller (Minibus)": {"seats": 12, "price_per_km": 38, "co2_per_km": 0.32},
+    "Charter Bus": {"seats": 40, "price_per_km": 85, "co2_per_km": 0.85},
+}
+SEAT_MODES = ["Flight", "Train", "Bus"]
+MAX_GROUP_SIZE = 200
+
+
+# --- BACKEND FUNCTIONS ---
+def build_fleet_options(distance, transport_options_map):
+    """Turn the per-route transport table into a list of fleet units (seats, cost, co2)"""
+    options = []
+    for mode in SEAT_MODES:
+        data = transport_options_map.get(mode)
+        # Routes without a service are stored with a zero price (e.g. no flights to Agra)
+        if not data or data.get("price_per_person", 0) <= 0:
+            continue
+        options.append({
+            "mode": mode,
+            "name": f"{data['name']} (seat)",
+            "seats": 1,
+            "cost": data["price_per_person"],
+            "co2": data["co2_per_person"],
+        })
+    for name, vehicle in CHARTER_VEHICLES.items():
+        options.append({
+            "mode": name,
+            "name": name,
+            "seats": vehicle["seats"],
+            "cost": int(distance * vehicle["price_per_km"]),
+            "co2": distance * vehicle["co2_per_km"],
+        })
+    return options
+
+
+def _pareto_prune(entries):
+    # Keep only (cost, co2) pairs that are not beaten on both axes by another entry
+    entries.sort(key=lambda e: (e[0], e[1]))
+    front = []
+    best_co2 = math.inf
+    for entry in entries:
+        if entry[1] < best_co2 - 1e-9:
+            front.append(entry)
+            best_co2 = entry[1]
+    return front
+
+
+def optimize_group(group_size, options, objective="co2", budget=None):
+    """
+    Split a group across fleet units so everyone has a seat.
+
+    Unbounded integer knapsack over "travelers seated". Each DP state keeps the
+    Pareto front of (cost, co2) so that the budget cap and either objective can
+    be answered exactly from one pass. Returns None if no plan fits the budget.
+    """
+    group_size = int(group_size)
+    if group_size <= 0 or not options:
+        return None
+
+    # fronts[p] = list of (cost, co2, back_pointer) for plans seating exactly p travelers
+    fronts = [[] for _ in range(group_size + 1)]
+    fronts[0] = [(0, 0.0, None)]
+
+    for seated in range(group_size):
+        if not fronts[seated]:
+            continue
+        fronts[seated] = _pareto_prune(fronts[seated])
+        for idx, (cost, co2, _) in enumerate(fronts[seated]):
+            for opt_idx, opt in enumerate(options):
+                new_cost = cost + opt["cost"]
+                if budget is not None and new_cost > budget:
+                    continue
+                nxt = min(group_size, seated + opt["seats"])
+                fronts[nxt].append((new_cost, co2 + opt["co2"], (seated, idx, opt_idx)))
+
+    final = _pareto_prune(fronts[group_size])
+    if not final:
+        return None
+
+    if objective == "cost":
+        best = min(final, key=lambda e: (e[0], e[1]))
+    else:
+        best = min(final, key=lambda e: (e[1], e[0]))
+
+    # Walk the back pointers to count how many of each unit were used
+    counts = {}
+    entry = best
+    while entry[2] is not None:
+        seated, idx, opt_idx = entry[2]
+        counts[opt_idx] = counts.get(opt_idx, 0) + 1
+        entry = fronts[seated][idx]
+
+    allocation = []
+    remaining = group_size
+    # Largest vehicles first so the leftover travelers land in the smaller units
+    for opt_idx in sorted(counts, key=lambda i: -options[i]["seats"]):
+        opt = options[opt_idx]
+        units = counts[opt_idx]
+        riders = min(remaining, units * opt["seats"])
+        remaining -= riders
+        allocation.append({
+            "mode": opt["mode"],
+            "name": opt["name"],
+            "units": units,
+            "travelers": riders,
+            "seats": units * opt["seats"],
+            "cost": units * opt["cost"],
+            "co2": units * opt["co2"],
+        })
+
+    return {
+        "group_size": group_size,
+        "objective": objective,
+        "budget": budget,
+        "total_cost": best[0],
+        "total_co2": best[1],
+        "allocation": allocation,
+    }
+
+
+def plan_group_trip(group_size, distance, transport_options_map, objective="co2", budget=None):
+    """One-call helper: build the fleet for a route and optimise the group split"""
+    options = build_fleet_options(distance, transport_options_map)
+    return optimize_group(group_size, options, objective=objective, budget=budget)
@@ -0,0 +1,259 @@
+import json
+import os
+import sys
+import threading
+import atexit
+import copy
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# --- EVENT LOG FILES ---
+EVENT_LOG_FILE = "calculations.jsonl"   # append-only, one calculation per line
+STATS_FILE = "impact_stats.json"        # snapshot of the running aggregates
+LOCK_FILE = "calculations.lock"         # serialises appends/snapshots across server processes
+FLUSH_INTERVAL = 2.0                    # seconds between background batch writes
+FLUSH_BATCH_SIZE = 50                   # flush early once this many events are waiting
+TREE_CO2_KG = 21                        # kg CO2 a tree absorbs per year (same factor as the dashboard)
+
+
+def _empty_stats():
+    return {
+        "calculations": 0,
+        "total_co2_savings": 0.0,
+        "total_money_savings": 0.0,
+        "total_percent_reduction": 0.0,
+        "total_trees_for_offset": 0,
+        "trees_saved": 0.0,
+        "destinations": {},
+        "routes": {},
+        "eco_transport": {},
+        "log_offset": 0,
+        "log_inode": None,
+    }
+
+
+def _apply_event(stats, event):
+    # Incremental update: every aggregate is a running sum or a counter
+    stats["calculations"] += 1
+    stats["total_co2_savings"] += event["co2_savings"]
+    stats["total_money_savings"] += event["savings"]
+    stats["total_percent_reduction"] += event["percent_reduction"]
+    stats["total_trees_for_offset"] += event["trees_for_offset"]
+    stats["trees_saved"] += max(event["co2_savings"], 0) / TREE_CO2_KG
+    dest = event["destination"]
+    route = f"{event['origin']} → {dest}"
+    eco_mode = event["eco_plan"]["transport"]
+    stats["destinations"][dest] = stats["destinations"].get(dest, 0) + 1
+    stats["routes"][route] = stats["routes"].get(route, 0) + 1
+    stats["eco_transport"][eco_mode] = stats["eco_transport"].get(eco_mode, 0) + 1
+
+
+def _catch_up(stats, log_file):
+    # Apply every complete line written after stats["log_offset"] (by this or any other process)
+    try:
+        st = os.stat(log_file)
+    except FileNotFoundError:
+        st = None
+    changed = False
+    # A missing, replaced or shorter log was rotated away: the totals already hold its
+    # events, so keep them and read the new log from the start
+    if st is None or st.st_size < stats["log_offset"] or stats["log_inode"] not in (None, st.st_ino):
+        changed = stats["log_offset"] != 0
+        stats["log_offset"] = 0
+    stats["log_inode"] = st.st_ino if st else None
+    if st is None or st.st_size == stats["log_offset"]:
+        return changed
+    with open(log_file, "rb") as f:
+        f.seek(stats["log_offset"])
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # half-written last line, picked up next time
+            try:
+                _apply_event(stats, json.loads(line.decode("utf-8")))
+            except (ValueError, KeyError):
+                pass
+            stats["log_offset"] += len(line)
+    return True
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive lock shared by every process that writes the log"""
+    with open(path, "a+b") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class ImpactLog:
+    """
+    Append-only calculation log with buffered writes and live aggregates.
+
+    Several server processes can share the same files: appends and snapshots happen
+    under an exclusive file lock, and every flush first replays whatever the other
+    processes appended, so each dashboard shows the totals of all of them.
+    """
+
+    def __init__(self, log_file=EVENT_LOG_FILE, stats_file=STATS_FILE, lock_file=LOCK_FILE, flush_interval=FLUSH_INTERVAL):
+        self.log_file = log_file
+        self.stats_file = stats_file
+        self.lock_file = lock_file
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()         # guards _stats and _pending
+        self._flush_lock = threading.Lock()   # one flush at a time in this process
+        self._pending = []
+        self._wake = threading.Event()
+        # _saved_stats mirrors what is on disk, _stats also includes queued events
+        with _file_lock(self.lock_file):
+            self._saved_stats = self._load_stats()
+        self._stats = copy.deepcopy(self._saved_stats)
+        self._worker = threading.Thread(target=self._run, name="impact-log-writer", daemon=True)
+        self._worker.start()
+        atexit.register(self.flush)
+
+    # --- LOADING ---
+    def _load_stats(self):
+        stats = _empty_stats()
+        if os.path.exists(self.stats_file):
+            try:
+                with open(self.stats_file, "r") as f:
+                    stats.update(json.load(f))
+            except:
+                stats = _empty_stats()
+        # Replay only what was appended after the last snapshot
+        _catch_up(stats, self.log_file)
+        return stats
+
+    # --- WRITE PATH ---
+    def record(self, event):
+        """Update aggregates in memory and queue the event; never touches disk"""
+        event = dict(event)
+        event.setdefault("timestamp", datetime.now().isoformat(timespec="seconds"))
+        with self._lock:
+            _apply_event(self._stats, event)
+            self._pending.append(event)
+            queued = len(self._pending)
+        if queued >= FLUSH_BATCH_SIZE:
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError as e:
+                # Keep the writer alive; the batch is still queued and goes out next round
+                print(f"impact log: write failed, retrying in {self.flush_interval}s: {e}", file=sys.stderr)
+
+    def _append(self, batch):
+        # Called with the file lock held; a failed write is cut back off so no half line is left
+        data = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in batch).encode("utf-8")
+        with open(self.log_file, "ab", buffering=0) as f:
+            start = f.seek(0, os.SEEK_END)
+            try:
+                written = 0
+                while written < len(data):
+                    written += f.write(data[written:])
+            except OSError:
+                try:
+                    f.truncate(start)
+                except OSError:
+                    pass
+                raise
+            self._saved_stats["log_inode"] = os.fstat(f.fileno()).st_ino
+        for event in batch:
+            _apply_event(self._saved_stats, event)
+        self._saved_stats["log_offset"] += len(data)
+
+    def flush(self):
+        """Append queued events in one write, pick up other processes' events, then snapshot"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            changed = False
+            try:
+                with _file_lock(self.lock_file):
+                    changed = _catch_up(self._saved_stats, self.log_file)
+                    appended = bool(batch)
+                    if batch:
+                        self._append(batch)
+                        batch = []
+                    if changed or appended:
+                        tmp_file = self.stats_file + ".tmp"
+                        with open(tmp_file, "w") as f:
+                            json.dump(self._saved_stats, f)
+                        os.replace(tmp_file, self.stats_file)
+            finally:
+                with self._lock:
+                    # batch is only non-empty if the append failed: requeue it ahead of newer events
+                    self._pending = batch + self._pending
+                    if changed:
+                        # Rebuild the live view: everything on disk plus what is still queued here
+                        stats = copy.deepcopy(self._saved_stats)
+                        for event in self._pending:
+                            _apply_event(stats, event)
+                        self._stats = stats
+
+    # --- READ PATH ---
+    def summary(self):
+        """O(1) headline numbers for the dashboard"""
+        with self._lock:
+            s = self._stats
+            count = s["calculations"]
+            return {
+                "calculations": count,
+                "total_co2_savings": s["total_co2_savings"],
+                "total_money_savings": s["total_money_savings"],
+                "avg_percent_reduction": s["total_percent_reduction"] / count if count else 0.0,
+                "trees_saved": int(s["trees_saved"]),
+                "total_trees_for_offset": s["total_trees_for_offset"],
+                "destinations_explored": len(s["destinations"]),
+                "routes_explored": len(s["routes"]),
+            }
+
+
+# --- SHARED INSTANCE ---
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_log():
+    """One log per server process, shared by every session and rerun"""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = ImpactLog()
+        return _instance
+
+
+def log_calculation(origin, destination, travelers, days, plan, eco_plan, co2_savings, savings, percent_reduction, trees_for_offset, username=""):
+    get_log().record({
+        "username": username,
+        "origin": origin,
+        "destination": destination,
+        "travelers": int(travelers),
+        "days": int(days),
+        "plan": plan,
+        "eco_plan": eco_plan,
+        "co2_savings": float(co2_savings),
+        "savings": float(savings),
+        "percent_reduction": float(percent_reduction),
+        "trees_for_offset": int(trees_for_offset),
+    })
@@ -0,0 +1,478 @@
+import os
+import sys
+import time
+import json
+import hmac
+import socket
+import sqlite3
+import hashlib
+import itertools
+import threading
+import socketserver
+from collections import OrderedDict
+from datetime import date, datetime
+from urllib.parse import urlparse, unquote
+
+# --- CACHE SETTINGS ---
+# sqlite:///path/to/file.db  -> shared by every process on this host
+# redis://[:password@]host:port/db -> shared across hosts (Redis or any RESP-speaking stand-in)
+CACHE_URL = os.environ.get("ECO_CACHE_URL", "sqlite:///eco_cache.db")
+DEFAULT_TTL = 24 * 3600     # seconds a shared entry lives
+LOCK_TTL = 30               # seconds a "computing" lock is held before it is considered dead
+LOCK_WAIT = 10              # seconds a worker waits for another worker's result
+LOCAL_SIZE = 512            # entries kept in the per-process tier
+PURGE_EVERY = 500           # SQLite writes between sweeps of expired rows
+KEY_PREFIX = "ecovihari"
+
+
+class CacheError(Exception):
+    pass
+
+
+# Failures of the store itself; the page falls back to computing locally on these
+BACKEND_ERRORS = (OSError, sqlite3.Error, CacheError)
+# Unserialisable values and corrupt entries
+ENCODING_ERRORS = (TypeError, ValueError, KeyError)
+
+
+def catalog_version(*tables):
+    """Short hash of the data tables; any edit to them changes every cache key"""
+    raw = json.dumps(tables, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def make_key(namespace, version, args):
+    digest = hashlib.sha1(repr(args).encode("utf-8")).hexdigest()
+    return f"{KEY_PREFIX}:{namespace}:{version}:{digest}"
+
+
+# --- VALUE ENCODING ---
+# Values are stored as JSON, never pickle: whoever can write to the shared store must
+# not be able to run code in the Streamlit workers that read it.
+def _json_default(obj):
+    if hasattr(obj, "dtypes") and hasattr(obj, "to_dict"):
+        # pandas DataFrame: keep the column dtypes so dates come back as datetimes
+        frame = obj.copy()
+        dtypes = {str(col): str(dtype) for col, dtype in frame.dtypes.items()}
+        for col, dtype in dtypes.items():
+            if dtype.startswith("datetime64"):
+                frame[col] = frame[col].dt.strftime("%Y-%m-%dT%H:%M:%S")
+        return {"__dataframe__": {"columns": list(dtypes), "data": frame.to_dict(orient="list"), "dtypes": dtypes}}
+    if hasattr(obj, "tolist"):
+        return obj.tolist()  # numpy scalars and arrays
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    raise TypeError(f"cannot cache values of type {type(obj).__name__}")
+
+
+def _json_object_hook(obj):
+    if "__dataframe__" in obj:
+        import pandas as pd
+        spec = obj["__dataframe__"]
+        return pd.DataFrame(spec["data"], columns=spec["columns"]).astype(spec["dtypes"])
+    return obj
+
+
+def encode_value(value):
+    return json.dumps(value, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+
+def decode_value(raw):
+    return json.loads(raw, object_hook=_json_object_hook)
+
+
+# --- SQLITE BACKEND ---
+class SQLiteBackend:
+    """Single-host store; WAL + mmap so concurrent readers never block each other"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._writes = itertools.count(1)
+        conn = self._conn()
+        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, expires REAL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)")
+        conn.execute("CREATE TABLE IF NOT EXISTS locks (key TEXT PRIMARY KEY, token TEXT, expires REAL)")
+        self.purge_expired()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA mmap_size=67108864")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return None
+        return row[0]
+
+    def set(self, key, value, ttl=None):
+        expires = time.time() + ttl if ttl else None
+        self._conn().execute("INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)", (key, value, expires))
+        # Keys carry travel dates, so old rows are never read again; sweep them now and then
+        if next(self._writes) % PURGE_EVERY == 0:
+            self.purge_expired()
+
+    def delete(self, key):
+        self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def acquire_lock(self, key, token, ttl):
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM locks WHERE key = ? AND expires < ?", (key, now))
+            cur = conn.execute("INSERT OR IGNORE INTO locks (key, token, expires) VALUES (?, ?, ?)", (key, token, now + ttl))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return cur.rowcount == 1
+
+    def release_lock(self, key, token):
+        self._conn().execute("DELETE FROM locks WHERE key = ? AND token = ?", (key, token))
+
+    def purge_expired(self):
+        now = time.time()
+        self._conn().execute("DELETE FROM cache WHERE expires IS NOT NULL AND expires < ?", (now,))
+        self._conn().execute("DELETE FROM locks WHERE expires < ?", (now,))
+
+
+# --- REDIS (RESP) BACKEND ---
+class RedisBackend:
+    """Minimal RESP client: GET / SET PX NX / DEL, enough for Redis, Valkey or the stand-in below"""
+
+    def __init__(self, host="localhost", port=6379, db=0, password=None, timeout=2.0):
+        self.address = (host, port)
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _sock(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.create_connection(self.address, timeout=self.timeout)
+            self._local.sock = sock
+            self._local.reader = sock.makefile("rb")
+            if self.password:
+                self._call("AUTH", self.password)
+            if self.db:
+                self._call("SELECT", self.db)
+        return sock
+
+    def _read_reply(self):
+        reader = self._local.reader
+        line = reader.readline()
+        if not line:
+            raise CacheError("connection closed by cache server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            raise CacheError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            size = int(body)
+            if size < 0:
+                return None
+            data = reader.read(size + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(body)
+            return None if count < 0 else [self._read_reply() for _ in range(count)]
+        raise CacheError(f"unexpected reply: {line!r}")
+
+    def _call(self, *args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        try:
+            self._sock().sendall(b"".join(parts))
+            return self._read_reply()
+        except (OSError, CacheError):
+            self._reset()
+            raise
+
+    def _reset(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self._local.sock = None
+
+    def get(self, key):
+        return self._call("GET", key)
+
+    def set(self, key, value, ttl=None):
+        if ttl:
+            self._call("SET", key, value, "PX", int(ttl * 1000))
+        else:
+            self._call("SET", key, value)
+
+    def delete(self, key):
+        self._call("DEL", key)
+
+    def acquire_lock(self, key, token, ttl):
+        return self._call("SET", f"lock:{key}", token, "NX", "PX", int(ttl * 1000)) == "OK"
+
+    def release_lock(self, key, token):
+        # Only drop the lock if we still own it (it may have expired and been taken over)
+        if self._call("GET", f"lock:{key}") == token.encode():
+            self._call("DEL", f"lock:{key}")
+
+    def purge_expired(self):
+        pass  # Redis expires keys itself
+
+
+# --- SHARED CACHE ---
+class SharedCache:
+    """
+    Two tiers: a small per-process LRU in front of a shared backend.
+
+    Concurrent misses on the same key are collapsed twice: threads in one process
+    wait on an in-process lock, and processes race for a backend lock so only one
+    of them computes while the rest poll for the stored result.
+    """
+
+    def __init__(self, backend, local_size=LOCAL_SIZE, default_ttl=DEFAULT_TTL):
+        self.backend = backend
+        self.local_size = local_size
+        self.default_ttl = default_ttl
+        self._local = OrderedDict()
+        self._local_lock = threading.Lock()
+        self._key_locks = {}
+
+    def _local_get(self, key):
+        with self._local_lock:
+            if key in self._local:
+                self._local.move_to_end(key)
+                return True, self._local[key]
+        return False, None
+
+    def _local_set(self, key, value):
+        with self._local_lock:
+            self._local[key] = value
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def _key_lock(self, key):
+        with self._local_lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def _backend_get(self, key):
+        raw = self.backend.get(key)
+        if raw is None:
+            return False, None
+        try:
+            return True, decode_value(raw)
+        except ENCODING_ERRORS:
+            return False, None  # corrupt entry: recompute and overwrite it
+
+    def _compute(self, key, compute, ttl=None):
+        """
+        Run compute() and hand back the value as a cache hit would return it.
+
+        Errors from compute() propagate; only encoding and the store write are guarded.
+        With ttl=None the value is not written to the shared store.
+        """
+        value = compute()
+        try:
+            raw = encode_value(value)
+        except ENCODING_ERRORS:
+            return value  # not JSON-serialisable, so never cached: return it as is
+        if ttl is not None:
+            try:
+                self.backend.set(key, raw, ttl)
+            except BACKEND_ERRORS:
+                pass
+        # JSON round-trip so a miss returns the same types as a hit (lists, not tuples)
+        return decode_value(raw)
+
+    def get_or_compute(self, namespace, version, args, compute, ttl=None):
+        key = make_key(namespace, version, args)
+        ttl = ttl or self.default_ttl
+
+        hit, value = self._local_get(key)
+        if hit:
+            return value
+
+        with self._key_lock(key):
+            hit, value = self._local_get(key)
+            if hit:
+                return value
+            value = self._shared_get_or_compute(key, compute, ttl)
+            self._local_set(key, value)
+        with self._local_lock:
+            self._key_locks.pop(key, None)
+        return value
+
+    def _shared_get_or_compute(self, key, compute, ttl):
+        token = f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}:{time.time()}"
+        deadline = time.time() + LOCK_WAIT
+        delay = 0.02
+        while True:
+            try:
+                hit, value = self._backend_get(key)
+                locked = not hit and self.backend.acquire_lock(key, token, LOCK_TTL)
+            except BACKEND_ERRORS:
+                # The cache must never take the page down; fall back to computing locally
+                return self._compute(key, compute)
+            if hit:
+                return value
+            if locked:
+                try:
+                    # Another worker may have finished between our GET and the lock
+                    try:
+                        hit, value = self._backend_get(key)
+                    except BACKEND_ERRORS:
+                        hit = False
+                    if hit:
+                        return value
+                    return self._compute(key, compute, ttl)
+                finally:
+                    try:
+                        self.backend.release_lock(key, token)
+                    except BACKEND_ERRORS:
+                        pass
+            if time.time() >= deadline:
+                return self._compute(key, compute)
+            time.sleep(delay)
+            delay = min(delay * 2, 0.25)
+
+
+def backend_from_url(url):
+    parsed = urlparse(url)
+    if parsed.scheme == "sqlite":
+        path = parsed.path[1:] if parsed.path.startswith("/") else parsed.path
+        return SQLiteBackend(path or "eco_cache.db")
+    if parsed.scheme == "redis":
+        db = int(parsed.path[1:]) if parsed.path[1:] else 0
+        password = unquote(parsed.password) if parsed.password else None
+        return RedisBackend(parsed.hostname or "localhost", parsed.port or 6379, db, password)
+    raise CacheError(f"unsupported cache url: {url}")
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_cache():
+    """One SharedCache per process, configured from ECO_CACHE_URL"""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = SharedCache(backend_from_url(CACHE_URL))
+        return _instance
+
+
+# --- LOCAL REDIS STAND-IN ---
+# `python shared_cache.py serve [port] [sqlite_path] [host]` speaks enough RESP for RedisBackend,
+# so several hosts can share one cache without installing Redis. It listens on localhost
+# unless told otherwise; set ECO_CACHE_PASSWORD to require AUTH (mandatory off-host).
+class _RespHandler(socketserver.StreamRequestHandler):
+    def _reply(self, value):
+        if value is None:
+            self.wfile.write(b"$-1\r\n")
+        elif isinstance(value, bytes):
+            self.wfile.write(b"$%d\r\n%s\r\n" % (len(value), value))
+        elif isinstance(value, int):
+            self.wfile.write(b":%d\r\n" % value)
+        elif isinstance(value, CacheError):
+            self.wfile.write(f"-{value}\r\n".encode())
+        else:
+            self.wfile.write(f"+{value}\r\n".encode())
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        count = int(line[1:-2])
+        args = []
+        for _ in range(count):
+            size = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def _check_auth(self, args):
+        password = self.server.password
+        if not password:
+            return CacheError("ERR AUTH <password> called without any password configured for the default user")
+        # AUTH <password> or AUTH <username> <password>
+        if len(args) in (2, 3) and hmac.compare_digest(args[-1], password.encode("utf-8")):
+            self.authenticated = True
+            return "OK"
+        return CacheError("WRONGPASS invalid username-password pair or user is disabled")
+
+    def handle(self):
+        store = self.server.store
+        self.authenticated = not self.server.password
+        while True:
+            args = self._read_command()
+            if args is None:
+                return
+            cmd = args[0].decode().upper()
+            key = args[1].decode() if len(args) > 1 else None
+            if cmd == "AUTH":
+                self._reply(self._check_auth(args))
+            elif not self.authenticated:
+                self._reply(CacheError("NOAUTH Authentication required."))
+            elif cmd in ("PING", "SELECT"):
+                self._reply("PONG" if cmd == "PING" else "OK")
+            elif cmd == "GET":
+                self._reply(store.get(key))
+            elif cmd == "DEL":
+                store.delete(key)
+                self._reply(1)
+            elif cmd == "SET":
+                opts = [a.decode().upper() for a in args[3:]]
+                ttl = int(opts[opts.index("PX") + 1]) / 1000 if "PX" in opts else None
+                if "EX" in opts:
+                    ttl = int(opts[opts.index("EX") + 1])
+                with self.server.write_lock:
+                    if "NX" in opts and store.get(key) is not None:
+                        self._reply(None)
+                        continue
+                    store.set(key, args[2], ttl)
+                self._reply("OK")
+            else:
+                self._reply(CacheError(f"ERR unknown command '{cmd}'"))
+
+
+class _RespServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def serve(port=6379, path="eco_cache_server.db", host="127.0.0.1", password=None):
+    password = password or os.environ.get("ECO_CACHE_PASSWORD")
+    if host not in ("127.0.0.1", "localhost", "::1") and not password:
+        sys.exit("Refusing to listen beyond localhost without a password: set ECO_CACHE_PASSWORD")
+    server = _RespServer((host, port), _RespHandler)
+    server.store = SQLiteBackend(path)
+    server.write_lock = threading.Lock()
+    server.password = password
+    print(f"Eco Vihari cache stand-in listening on {host}:{port} (store: {path})")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        serve(int(sys.argv[2]) if len(sys.argv) > 2 else 6379,
+              sys.argv[3] if len(sys.argv) > 3 else "eco_cache_server.db",
+              sys.argv[4] if len(sys.argv) > 4 else "127.0.0.1")
+    else:
+        print("usage: python shared_cache.py serve [port] [sqlite_path] [host]")